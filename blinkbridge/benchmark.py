@@ -0,0 +1,257 @@
+import argparse
+import json
+import logging
+import multiprocessing
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from queue import Empty
+from typing import Callable, Dict, List
+import blinkbridge.ffmpeg as ffmpeg
+from blinkbridge.config import *
+
+
+log = logging.getLogger(__name__)
+
+# synthetic clips roughly matching what Blink cameras record
+CLIP_PROFILES = {
+    'mini_720p': {'size': '1280x720', 'fps': 15, 'bit_rate': '1M', 'profile': 'main'},
+    'outdoor_1080p': {'size': '1920x1080', 'fps': 30, 'bit_rate': '2M', 'profile': 'high'},
+    'doorbell_1440p': {'size': '1080x1440', 'fps': 30, 'bit_rate': '2M', 'profile': 'high'},
+}
+
+CLIP_DURATION = 10
+STILL_VIDEO_DURATION = 0.5
+
+def make_synthetic_clip(file_name: Path, size: str, fps: int, bit_rate: str, profile: str) -> Path:
+    '''
+    Generate an h264/aac clip with lavfi test sources
+    '''
+    ffmpeg_params = [
+        'ffmpeg',
+        *COMMON_FFMPEG_ARGS,
+        '-f', 'lavfi',
+        '-i', f"testsrc2=size={size}:rate={fps}:duration={CLIP_DURATION}",
+        '-f', 'lavfi',
+        '-i', f"sine=frequency=440:sample_rate=16000:duration={CLIP_DURATION}",
+        '-c:v', 'libx264',
+        '-profile:v', profile,
+        '-pix_fmt', 'yuv420p',
+        '-b:v', bit_rate,
+        '-c:a', 'aac',
+        '-ac', '1',
+        '-movflags', 'faststart',
+        file_name
+    ]
+
+    subprocess.run(ffmpeg_params, check=True)
+
+    return file_name
+
+def prepare_inputs(clip: Path, work_dir: Path) -> Dict:
+    '''
+    Extract the stream parameters and last frame that FrameToVideo needs
+    '''
+    frame = work_dir / f"{clip.stem}_frame.jpg"
+    ffmpeg.VideoToLastFrame(clip, frame).wait()
+    params_audio, params_video = ffmpeg.StreamParameters(clip).wait()
+
+    return {'frame': frame, 'params_audio': params_audio, 'params_video': params_video}
+
+def _bench_last_frame(clip: Path, work_dir: Path, inputs: Dict) -> None:
+    ffmpeg.VideoToLastFrame(clip, work_dir / 'last_frame.jpg').wait()
+
+def _bench_stream_parameters(clip: Path, work_dir: Path, inputs: Dict) -> None:
+    ffmpeg.StreamParameters(clip).wait()
+
+def _bench_frame_to_video(clip: Path, work_dir: Path, inputs: Dict) -> None:
+    ffmpeg.FrameToVideo(inputs['frame'], inputs['params_video'], inputs['params_audio'],
+                        output_duration=STILL_VIDEO_DURATION,
+                        file_name_output_video=work_dir / 'still.mp4').wait()
+
+def _bench_still_video(clip: Path, work_dir: Path, inputs: Dict) -> None:
+    ffmpeg.StillVideoCreator(clip,
+                             output_duration=STILL_VIDEO_DURATION,
+                             file_name_still_video=work_dir / 'still.mp4').wait()
+
+HELPERS = {
+    'VideoToLastFrame': _bench_last_frame,
+    'StreamParameters': _bench_stream_parameters,
+    'FrameToVideo': _bench_frame_to_video,
+    'StillVideoCreator': _bench_still_video,
+}
+
+def _snapshot() -> Dict:
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    return {'wall': time.perf_counter(), 'cpu': usage.ru_utime + usage.ru_stime}
+
+def _get_max_rss_kb() -> int:
+    max_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return max_rss // 1024 if sys.platform == 'darwin' else max_rss
+
+def _measure(helper: Callable, clip: Path, work_dir: Path, inputs: Dict, queue: multiprocessing.Queue) -> None:
+    # runs in a fresh process so RUSAGE_CHILDREN only covers this helper's ffmpeg processes
+    ffmpeg.PATH_VIDEOS = work_dir
+    start = _snapshot()
+    helper(clip, work_dir, inputs)
+    end = _snapshot()
+
+    queue.put({
+        'wall': end['wall'] - start['wall'],
+        'cpu': end['cpu'] - start['cpu'],
+        'max_rss_kb': _get_max_rss_kb(),
+    })
+
+def measure(helper: Callable, clip: Path, work_dir: Path, inputs: Dict) -> Dict:
+    ctx = multiprocessing.get_context('fork')
+    queue = ctx.Queue()
+    process = ctx.Process(target=_measure, args=(helper, clip, work_dir, inputs, queue))
+    process.start()
+
+    # read the result before joining, the child can't exit until its queued data is flushed
+    result = None
+    while result is None and process.is_alive():
+        try:
+            result = queue.get(timeout=1)
+        except Empty:
+            pass
+
+    # the child may have put its result just before exiting
+    if result is None:
+        try:
+            result = queue.get(timeout=1)
+        except Empty:
+            pass
+
+    process.join()
+
+    if process.exitcode != 0 or result is None:
+        raise Exception(f"benchmark process failed with exit code {process.exitcode}")
+
+    return result
+
+def run_benchmarks(work_dir: Path, repeat: int=5, profiles: List[str]=None, helpers: List[str]=None) -> Dict:
+    results = {}
+
+    for profile_name in profiles or CLIP_PROFILES:
+        clip = work_dir / f"{profile_name}.mp4"
+
+        log.info(f"{profile_name}: generating synthetic clip")
+        make_synthetic_clip(clip, **CLIP_PROFILES[profile_name])
+
+        # done once here so it isn't counted in any helper's measurements
+        inputs = prepare_inputs(clip, work_dir)
+
+        for helper_name in helpers or HELPERS:
+            runs = [measure(HELPERS[helper_name], clip, work_dir, inputs) for _ in range(repeat)]
+
+            # report the median of each metric to reduce noise
+            result = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+            results[f"{profile_name}/{helper_name}"] = result
+
+            log.info(f"{profile_name}/{helper_name}: wall {result['wall']:.3f}s, "
+                     f"cpu {result['cpu']:.3f}s, peak rss {result['max_rss_kb'] / 1024:.1f} MiB")
+
+    return results
+
+def compare(results: Dict, baseline: Dict, threshold: float, min_delta: float) -> List[str]:
+    '''
+    Compare results against a baseline, returns a list of regressions
+
+    Wall and CPU times must also be at least min_delta seconds slower so that
+    scheduler noise on short helpers isn't reported.
+    '''
+    regressions = []
+
+    for name, result in results.items():
+        if name not in baseline:
+            log.warning(f"{name}: not in baseline, skipping")
+            continue
+
+        for key in ('wall', 'cpu', 'max_rss_kb'):
+            old, new = baseline[name][key], result[key]
+            change = (new - old) / old if old else 0.0
+            line = f"{name} {key}: {old:.3f} -> {new:.3f} ({change:+.1%})"
+
+            if change > threshold and (key == 'max_rss_kb' or new - old > min_delta):
+                regressions.append(line)
+                log.warning(f"regression: {line}")
+            else:
+                log.info(line)
+
+    return regressions
+
+def get_ffmpeg_version() -> str:
+    out = subprocess.run(['ffmpeg', '-version'], capture_output=True, text=True, check=True).stdout
+
+    return out.splitlines()[0]
+
+def positive_int(value: str) -> int:
+    number = int(value)
+
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+
+    return number
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the ffmpeg helpers with synthetic clips')
+    parser.add_argument('--repeat', type=positive_int, default=5, help='runs per helper, the median is reported')
+    parser.add_argument('--profile', action='append', choices=CLIP_PROFILES, help='clip profile(s) to run')
+    parser.add_argument('--helper', action='append', choices=HELPERS, help='helper(s) to run')
+    parser.add_argument('--save-baseline', type=Path, help='save results as a baseline to this file')
+    parser.add_argument('--compare', type=Path, help='compare results against this baseline file')
+    parser.add_argument('--threshold', type=float, default=0.1, help='relative slowdown reported as a regression')
+    parser.add_argument('--min-delta', type=float, default=0.02,
+                        help='minimum wall/cpu slowdown in seconds reported as a regression')
+    args = parser.parse_args()
+
+    work_dir = Path(tempfile.mkdtemp(prefix='blinkbridge_bench_'))
+
+    try:
+        results = run_benchmarks(work_dir, repeat=args.repeat, profiles=args.profile, helpers=args.helper)
+    finally:
+        shutil.rmtree(work_dir)
+
+    regressions = []
+
+    # compare before saving in case both point at the same file
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+        if (baseline['ffmpeg'] != get_ffmpeg_version() or baseline['platform'] != sys.platform
+            or baseline['machine'] != platform.machine()):
+            log.warning(f"baseline was recorded with {baseline['ffmpeg']} on {baseline['platform']} {baseline['machine']}")
+
+        regressions = compare(results, baseline['results'], args.threshold, args.min_delta)
+
+    if args.save_baseline:
+        log.info(f"saving baseline to {args.save_baseline}")
+        with open(args.save_baseline, 'w') as f:
+            json.dump({
+                'ffmpeg': get_ffmpeg_version(),
+                'platform': sys.platform,
+                'machine': platform.machine(),
+                'results': results,
+            }, f, indent=2)
+
+    if regressions:
+        log.error(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+        return 1
+
+    return 0
+
+if __name__ == "__main__":
+    logging.basicConfig(format="%(message)s", level=logging.INFO)
+
+    sys.exit(main())
@@ -4,8 +4,11 @@ import json
 from datetime import datetime, timedelta
 from typing import Union
 import os
+import copy
 
 
+log = logging.getLogger(__name__)
+
 __all__ = ['COMMON_FFMPEG_ARGS', 'CONFIG', 'DELAY_RESTART', 'RTSP_URL', 'PATH_VIDEOS', 'PATH_CONCAT', 'PATH_CONFIG']
 
 COMMON_FFMPEG_ARGS = [
@@ -34,6 +37,60 @@ def load_config_file(file_name: Union[str, Path]) -> None:
     PATH_CONCAT = Path(CONFIG['paths']['concat'])
     PATH_CONFIG = Path(CONFIG['paths']['config'])
 
+def validate_config(config: dict) -> None:
+    '''
+    Check the settings that are used while running, raises ValueError if any are invalid
+    '''
+    try:
+        for key in ('enabled', 'disabled'):
+            if not isinstance(config['cameras'][key], list):
+                raise ValueError(f"cameras.{key} must be a list")
+
+        for section, key in (('cameras', 'max_failures'), ('cameras', 'restart_delay_seconds'),
+                             ('blink', 'history_days'), ('blink', 'poll_interval')):
+            if not isinstance(config[section][key], (int, float)):
+                raise ValueError(f"{section}.{key} must be a number")
+
+        if not isinstance(config['still_video_duration'], (int, float)):
+            raise ValueError("still_video_duration must be a number")
+
+        # getLevelName maps known level names to their int value
+        level = config['log_level']
+        if not isinstance(level, int) and not isinstance(logging.getLevelName(level), int):
+            raise ValueError(f"invalid log_level {config['log_level']!r}")
+    except KeyError as e:
+        raise ValueError(f"missing config key {e}")
+
+def reload_config_file(file_name: Union[str, Path]) -> dict:
+    '''
+    Re-read config file and update CONFIG in place, returns the previous config
+    '''
+    global DELAY_RESTART
+
+    with open(file_name) as f:
+        new_config = json.load(f)
+
+    validate_config(new_config)
+
+    # these are only used at startup so keep the running values
+    if (new_config['paths'] != CONFIG['paths'] or new_config['rtsp_server'] != CONFIG['rtsp_server']
+        or new_config['blink']['login'] != CONFIG['blink']['login']):
+        log.warning('changes to paths, rtsp_server or blink login require a restart, ignoring')
+
+    new_config['paths'] = CONFIG['paths']
+    new_config['rtsp_server'] = CONFIG['rtsp_server']
+    new_config['blink']['login'] = CONFIG['blink']['login']
+
+    delay_restart = timedelta(seconds=new_config['cameras']['restart_delay_seconds'])
+
+    # update in place so modules that imported CONFIG see the changes
+    old_config = copy.deepcopy(CONFIG)
+    CONFIG.clear()
+    CONFIG.update(new_config)
+    DELAY_RESTART = delay_restart
+
+    return old_config
+
 config_file = os.getenv('BLINKBRIDGE_CONFIG', 'config.json')
 load_config_file(config_file)
  
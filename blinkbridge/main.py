@@ -4,20 +4,30 @@ import logging
 import os
 from datetime import datetime, timedelta
 from collections import defaultdict
+from typing import Union
 from rich.logging import RichHandler
 from rich.highlighter import NullHighlighter, JSONHighlighter
 from blinkbridge.stream_server import StreamServer
 from blinkbridge.blink import CameraManager
 from blinkbridge.config import *
+from blinkbridge import config
 
 
 log = logging.getLogger(__name__)
 
+def get_config_mtime() -> Union[float, None]:
+    try:
+        return os.path.getmtime(config.config_file)
+    except OSError:
+        return None
+
 class Application:
     def __init__(self):
         self.stream_servers = {}
         self.cam_manager = None
         self.running = False
+        self.reload_requested = False
+        self.config_mtime = get_config_mtime()
 
     async def start_stream(self, camera_name: str, redownload: bool=False) -> StreamServer:
         if redownload:
@@ -49,14 +59,74 @@ class Application:
 
         return True
         
+    def get_enabled_cameras(self, config_cameras: dict) -> set:
+        enabled_cameras = set(config_cameras['enabled']) if config_cameras['enabled'] else set(self.cam_manager.get_cameras())
+
+        return enabled_cameras - set(config_cameras['disabled'])
+
+    def request_reload(self) -> None:
+        self.reload_requested = True
+
+    async def reload_config(self) -> None:
+        '''
+        Reload config file and only start/stop the cameras that changed
+        '''
+        self.reload_requested = False
+
+        # record the attempted mtime even if loading fails so an invalid file isn't retried every poll,
+        # saving the file again changes the mtime and triggers another reload
+        self.config_mtime = get_config_mtime()
+
+        log.info(f"reloading config from {config.config_file}")
+        try:
+            config.reload_config_file(config.config_file)
+        except Exception as e:
+            log.error(f"failed to reload config, keeping current config: {e}")
+            return
+
+        logging.getLogger('blinkbridge').setLevel(CONFIG['log_level'])
+        log.setLevel(CONFIG['log_level'])
+
+        # compare against the running streams so cameras that failed to start or were
+        # dropped after too many failures are started again
+        enabled_cameras = self.get_enabled_cameras(CONFIG['cameras'])
+        running_cameras = set(self.stream_servers)
+
+        for camera_name in running_cameras - enabled_cameras:
+            ss = self.stream_servers.pop(camera_name)
+            log.info(f"{camera_name}: disabled in config")
+            try:
+                ss.close()
+            except Exception as e:
+                log.error(f"{camera_name}: failed to stop stream: {e}")
+
+        for camera_name in enabled_cameras - running_cameras:
+            if camera_name not in self.cam_manager.get_cameras():
+                log.warning(f"{camera_name}: camera not found, skipping")
+                continue
+
+            log.info(f"{camera_name}: starting stream")
+            try:
+                ss = await self.start_stream(camera_name)
+            except Exception as e:
+                log.error(f"{camera_name}: failed to start stream: {e}")
+                continue
+
+            ss.failure_count = 0
+            ss.datetime_started = datetime.now()
+
+    def config_file_changed(self) -> bool:
+        config_mtime = get_config_mtime()
+
+        return config_mtime is not None and config_mtime != self.config_mtime
+
     async def start(self) -> None:
         self.running = True
         self.cam_manager = CameraManager()
         await self.cam_manager.start()
 
         # get enabled cameras
-        enabled_cameras = set(CONFIG['cameras']['enabled']) if CONFIG['cameras']['enabled'] else set(self.cam_manager.get_cameras())
-        enabled_cameras = enabled_cameras - set(CONFIG['cameras']['disabled'])
+        enabled_cameras = self.get_enabled_cameras(CONFIG['cameras'])
         log.info(f"enabled cameras: {enabled_cameras}")      
 
         # create stream servers for each camera
@@ -70,6 +140,10 @@ class Application:
 
         log.info(f"monitoring cameras for motion")
         while self.running:
+            # apply config changes between polls so stream servers aren't modified mid-loop
+            if self.reload_requested or self.config_file_changed():
+                await self.reload_config()
+
             # check for motion on each stream server
             for camera_name in self.stream_servers:
                 try:                   
@@ -92,7 +166,7 @@ class Application:
                     log.warning(f"{camera_name}: server failed {ss.failure_count + 1} time(s)")
 
                     # do nothing if stream was last started less certain time ago
-                    if datetime.now() < ss.datetime_started + DELAY_RESTART:
+                    if datetime.now() < ss.datetime_started + config.DELAY_RESTART:
                         continue
 
                     # create new stream server
@@ -126,6 +200,9 @@ async def main() -> None:
     for sig in (signal.SIGINT, signal.SIGTERM):
         loop.add_signal_handler(sig, handle_exit)
 
+    # reload config on SIGHUP
+    loop.add_signal_handler(signal.SIGHUP, app.request_reload)
+
     try:
         # Start the application
         start_task = asyncio.create_task(app.start())